@@ -3,11 +3,17 @@ AI Coding Tutor System
 A comprehensive learning platform that provides personalized coding guidance
 """
 
+import bisect
+import hashlib
 import json
 import random
+import re
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from enum import Enum
 
 
@@ -31,9 +37,34 @@ class ProblemCategory(Enum):
     MACHINE_LEARNING = "machine_learning"
 
 
+# Enum members materialized once; iterating an Enum class is comparatively slow
+_ALL_CATEGORIES = tuple(ProblemCategory)
+
+# Dense integer codes for enum members, used to index compact per-student state
+_CATEGORY_INDEX = {category: i for i, category in enumerate(_ALL_CATEGORIES)}
+_DIFFICULTY_LEVELS = tuple(DifficultyLevel)
+_DIFFICULTY_INDEX = {level: i for i, level in enumerate(_DIFFICULTY_LEVELS)}
+
+
+def _to_iso(timestamp_ns: int) -> str:
+    """Format a time.time_ns() timestamp as an ISO-8601 UTC string"""
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    moment = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    return moment.replace(microsecond=nanoseconds // 1000).isoformat()
+
+
 class CodeAnalysis:
     """Analyzes student code for quality and correctness"""
     
+    # Names and numbers only count as whole words, so 'database' or 'x1005'
+    # do not trigger the naming/hardcoded-value checks
+    _naming_re = re.compile(r'\b(?:temp|var|data|value)\b')
+    _hardcoded_re = re.compile(r'\b(?:5|10|100|1000)\b')
+    # Bit i of a scan result is set when _PYTHON_RULES[i] is triggered
+    _PYTHON_RULES = ('missing_docstrings', 'inefficient_loops', 'poor_naming',
+                     'no_error_handling', 'hardcoded_values')
+    _ANALYSIS_CACHE_SIZE = 4096
+    
     def __init__(self):
         self.common_issues = {
             'python': {
@@ -44,6 +75,8 @@ class CodeAnalysis:
                 'hardcoded_values': "Use constants or configuration variables"
             }
         }
+        # (source digest, language) -> (line_count, suggestions), least recently used first
+        self._analysis_cache = OrderedDict()
     
     def analyze_code_quality(self, code: str, language: ProgrammingLanguage) -> Dict:
         """Comprehensive code analysis with specific feedback"""
@@ -54,37 +87,53 @@ class CodeAnalysis:
             'best_practices': []
         }
         
+        analysis['line_count'], suggestions = self._analyze_cached(code, language)
+        analysis['suggestions'].extend(suggestions)
+        
+        # Calculate overall score
+        analysis['score'] = self._calculate_code_score(analysis)
+        
+        return analysis
+    
+    def _analyze_cached(self, code: str, language: ProgrammingLanguage) -> Tuple[int, Tuple[str, ...]]:
+        """Line count and suggestions for code, memoized on a digest of the source"""
+        key = (hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest(), language)
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(key)
+            return cached
+        
+        analysis = {'suggestions': []}
+        
         # Basic code quality checks
-        lines = code.split('\n')
-        analysis['line_count'] = len(lines)
+        line_count = code.count('\n') + 1
         
         # Check for common issues
         if language == ProgrammingLanguage.PYTHON:
             self._analyze_python_code(code, analysis)
         
-        # Calculate overall score
-        analysis['score'] = self._calculate_code_score(analysis)
-        
-        return analysis
+        cached = self._analysis_cache[key] = (line_count, tuple(analysis['suggestions']))
+        if len(self._analysis_cache) > self._ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return cached
     
     def _analyze_python_code(self, code: str, analysis: Dict) -> None:
         """Python-specific code analysis"""
-        checks = [
-            (lambda c: 'def ' in c and '"""' not in c and "'''" not in c, 
-             self.common_issues['python']['missing_docstrings']),
-            (lambda c: 'for ' in c and 'range(len(' in c, 
-             self.common_issues['python']['inefficient_loops']),
-            (lambda c: any(word in c for word in ['temp', 'var', 'data', 'value']),
-             self.common_issues['python']['poor_naming']),
-            (lambda c: 'input()' in c and 'try:' not in c,
-             self.common_issues['python']['no_error_handling']),
-            (lambda c: any(str(num) in c for num in [10, 100, 1000, 5]),
-             self.common_issues['python']['hardcoded_values'])
-        ]
-        
-        for check, message in checks:
-            if check(code):
-                analysis['suggestions'].append(message)
+        triggered = self._scan_python_code(code)
+        for bit, rule in enumerate(self._PYTHON_RULES):
+            if triggered >> bit & 1:
+                analysis['suggestions'].append(self.common_issues['python'][rule])
+    
+    def _scan_python_code(self, code: str) -> int:
+        """Scan Python code, returning a bitmask of triggered rules"""
+        checks = (
+            'def ' in code and '"""' not in code and "'''" not in code,  # missing_docstrings
+            'for ' in code and 'range(len(' in code,                        # inefficient_loops
+            bool(self._naming_re.search(code)),                             # poor_naming
+            'input()' in code and 'try:' not in code,                       # no_error_handling
+            bool(self._hardcoded_re.search(code))                           # hardcoded_values
+        )
+        return sum(triggered << bit for bit, triggered in enumerate(checks))
 
 
 class CodingProblem:
@@ -100,69 +149,111 @@ class CodingProblem:
         self.language = language
         self.difficulty = difficulty
         self.test_cases = test_cases
-        self.hints = []
+        self.hints = []  # Kept sorted by level
+        self._hint_levels = []  # Level of each entry in self.hints, for bisection
         self.solution_approach = ""
+        self.index = None  # Position in the tutor's catalog, assigned on registration
     
     def add_hint(self, hint: str, level: int = 1) -> None:
         """Add hierarchical hints - more specific hints have higher levels"""
-        self.hints.append({'level': level, 'hint': hint})
+        position = bisect.bisect_right(self._hint_levels, level)
+        self._hint_levels.insert(position, level)
+        self.hints.insert(position, {'level': level, 'hint': hint})
     
     def get_hint(self, current_level: int) -> Optional[str]:
         """Get appropriate hint based on student's current struggle level"""
-        available_hints = [h for h in self.hints if h['level'] <= current_level]
-        return random.choice(available_hints)['hint'] if available_hints else None
+        # Hints at or below current_level form a prefix of the sorted list
+        available = bisect.bisect_right(self._hint_levels, current_level)
+        return self.hints[random.randrange(available)]['hint'] if available else None
 
 
 class StudentProgress:
     """Tracks and manages student learning progress"""
     
+    # Every category starts at BEGINNER (code 0); copied per student
+    _DEFAULT_SKILL_CODES = bytes(len(_CATEGORY_INDEX))
+    
     def __init__(self, student_id: str):
         self.student_id = student_id
-        self.completed_problems = set()
+        self.completed_mask = 0  # One bit per completed problem, keyed by problem.index
         self.current_streak = 0
         self.longest_streak = 0
-        self.skill_levels = {
-            category: DifficultyLevel.BEGINNER 
-            for category in ProblemCategory
-        }
+        # Index into _DIFFICULTY_LEVELS for each category, keyed by _CATEGORY_INDEX
+        self._skill_codes = bytearray(self._DEFAULT_SKILL_CODES)
         self.performance_metrics = {}
     
+    @property
+    def completed_count(self) -> int:
+        """Number of distinct problems the student has solved"""
+        return bin(self.completed_mask).count('1')
+    
+    @property
+    def skill_levels(self) -> Mapping[ProblemCategory, DifficultyLevel]:
+        """Read-only view of the difficulty level reached in every category"""
+        return MappingProxyType({
+            category: _DIFFICULTY_LEVELS[code]
+            for category, code in zip(_ALL_CATEGORIES, self._skill_codes)
+        })
+    
+    def skill_level(self, category: ProblemCategory) -> DifficultyLevel:
+        """Difficulty level reached in a single category"""
+        return _DIFFICULTY_LEVELS[self._skill_codes[_CATEGORY_INDEX[category]]]
+    
+    def set_skill_level(self, category: ProblemCategory, level: DifficultyLevel) -> None:
+        """Set the difficulty level reached in a single category"""
+        self._skill_codes[_CATEGORY_INDEX[category]] = _DIFFICULTY_INDEX[level]
+    
+    @staticmethod
+    def _problem_bit(problem: CodingProblem) -> int:
+        """Bit representing a problem in completed_mask"""
+        if problem.index is None:
+            raise ValueError("problem is not registered in a tutor catalog")
+        return 1 << problem.index
+    
+    def has_completed(self, problem: CodingProblem) -> bool:
+        """Check whether the student has already solved a problem"""
+        return bool(self.completed_mask & self._problem_bit(problem))
+    
     def update_progress(self, problem: CodingProblem, success: bool, 
                        code_quality_score: float) -> None:
         """Update student progress based on problem attempt"""
         if success:
-            self.completed_problems.add(problem.problem_id)
+            self.completed_mask |= self._problem_bit(problem)
             self.current_streak += 1
             self.longest_streak = max(self.longest_streak, self.current_streak)
             
             # Update skill level based on performance
-            if code_quality_score > 80 and problem.difficulty == self.skill_levels[problem.category]:
+            if code_quality_score > 80 and problem.difficulty == self.skill_level(problem.category):
                 self._promote_skill_level(problem.category)
         else:
             self.current_streak = 0
     
     def _promote_skill_level(self, category: ProblemCategory) -> None:
         """Promote student to next difficulty level in a category"""
-        current = self.skill_levels[category]
-        if current == DifficultyLevel.BEGINNER:
-            self.skill_levels[category] = DifficultyLevel.INTERMEDIATE
-        elif current == DifficultyLevel.INTERMEDIATE:
-            self.skill_levels[category] = DifficultyLevel.ADVANCED
+        i = _CATEGORY_INDEX[category]
+        self._skill_codes[i] = min(self._skill_codes[i] + 1, len(_DIFFICULTY_LEVELS) - 1)
 
 
 class AICodingTutor:
     """Main AI Coding Tutor class that orchestrates the learning experience"""
     
-    def __init__(self):
+    # Default number of most recent sessions kept for analytics
+    _SESSION_HISTORY_LIMIT = 100_000
+    
+    def __init__(self, session_history_limit: Optional[int] = _SESSION_HISTORY_LIMIT):
         self.code_analyzer = CodeAnalysis()
-        self.problems = self._initialize_problems()
+        self.problems = []  # Indexed by problem.index
+        self._pid_to_idx = {}
+        # Bitmasks of problem indices per (category, difficulty) code, for fast recommendation
+        self._category_difficulty_masks = defaultdict(int)
+        self._difficulty_masks = defaultdict(int)
+        self._initialize_problems()
         self.students = {}
-        self.session_history = []
+        # Oldest sessions are dropped past session_history_limit; None keeps all of them
+        self.session_history = deque(maxlen=session_history_limit)
     
-    def _initialize_problems(self) -> Dict[str, CodingProblem]:
+    def _initialize_problems(self) -> None:
         """Initialize a set of sample coding problems"""
-        problems = {}
-        
         # Problem 1: Fibonacci Sequence
         fib_problem = CodingProblem(
             problem_id="fib_001",
@@ -181,7 +272,7 @@ class AICodingTutor:
         fib_problem.add_hint("The Fibonacci sequence starts with 0 and 1")
         fib_problem.add_hint("Each subsequent number is the sum of the previous two")
         fib_problem.add_hint("Consider using recursion or iteration")
-        problems[fib_problem.problem_id] = fib_problem
+        self.add_problem(fib_problem)
         
         # Problem 2: Palindrome Checker
         palindrome_problem = CodingProblem(
@@ -201,9 +292,27 @@ class AICodingTutor:
         palindrome_problem.add_hint("A palindrome reads the same forwards and backwards")
         palindrome_problem.add_hint("Consider removing spaces and converting to lowercase")
         palindrome_problem.add_hint("You can reverse the string and compare")
-        problems[palindrome_problem.problem_id] = palindrome_problem
+        self.add_problem(palindrome_problem)
+    
+    def add_problem(self, problem: CodingProblem) -> None:
+        """Register a problem in the catalog, assigning its integer index"""
+        if problem.index is not None:
+            raise ValueError(f"problem {problem.problem_id!r} is already registered in a tutor catalog")
+        if problem.problem_id in self._pid_to_idx:
+            raise ValueError(f"duplicate problem id {problem.problem_id!r}")
         
-        return problems
+        problem.index = len(self.problems)
+        self.problems.append(problem)
+        self._pid_to_idx[problem.problem_id] = problem.index
+        
+        bit = 1 << problem.index
+        difficulty = _DIFFICULTY_INDEX[problem.difficulty]
+        self._category_difficulty_masks[_CATEGORY_INDEX[problem.category], difficulty] |= bit
+        self._difficulty_masks[difficulty] |= bit
+    
+    def get_problem(self, problem_id: str) -> CodingProblem:
+        """Look up a problem by its string id"""
+        return self.problems[self._pid_to_idx[problem_id]]
     
     def register_student(self, student_id: str) -> StudentProgress:
         """Register a new student"""
@@ -218,79 +327,101 @@ class AICodingTutor:
         
         if category is None:
             # Recommend category where student needs most practice
-            category = random.choice(list(ProblemCategory))
+            category = random.choice(_ALL_CATEGORIES)
         
-        target_difficulty = student.skill_levels[category]
+        target_difficulty = _DIFFICULTY_INDEX[student.skill_level(category)]
         
-        # Find problems matching category and difficulty
-        suitable_problems = [
-            p for p in self.problems.values() 
-            if p.category == category and p.difficulty == target_difficulty
-            and p.problem_id not in student.completed_problems
-        ]
+        # Find uncompleted problems matching category and difficulty
+        candidates = (self._category_difficulty_masks.get((_CATEGORY_INDEX[category], target_difficulty), 0)
+                      & ~student.completed_mask)
         
-        if not suitable_problems:
+        if not candidates:
             # Fallback to any problem at appropriate difficulty
-            suitable_problems = [
-                p for p in self.problems.values() 
-                if p.difficulty == target_difficulty
-                and p.problem_id not in student.completed_problems
-            ]
+            candidates = self._difficulty_masks.get(target_difficulty, 0) & ~student.completed_mask
         
-        return random.choice(suitable_problems) if suitable_problems else list(self.problems.values())[0]
+        return self.problems[self._pick_index(candidates)] if candidates else self.problems[0]
+    
+    @staticmethod
+    def _pick_index(mask: int) -> int:
+        """Pick the index of a random set bit in a non-empty bitmask"""
+        indices = []
+        while mask:
+            lowest = mask & -mask
+            indices.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return random.choice(indices)
     
     def submit_solution(self, student_id: str, problem_id: str, 
                        code: str) -> Dict:
         """Process student code submission and provide feedback"""
         student = self.students[student_id]
-        problem = self.problems[problem_id]
+        problem = self.get_problem(problem_id)
         
         # Analyze code quality
         analysis = self.code_analyzer.analyze_code_quality(code, problem.language)
         
         # Test the code (simplified - in reality, you'd execute in a sandbox)
-        test_results = self._run_tests(code, problem.test_cases)
+        passed, actuals, errors = self._run_tests(code, problem.test_cases)
         
         # Update student progress
-        success_rate = sum(1 for result in test_results if result['passed']) / len(test_results)
+        success_rate = sum(passed) / len(passed)
         student.update_progress(problem, success_rate > 0.8, analysis['score'])
         
         # Log session
         self._log_session(student_id, problem_id, success_rate, analysis['score'])
         
         return {
-            'test_results': test_results,
+            'test_results': self._format_test_results(problem.test_cases, passed, actuals, errors),
             'code_analysis': analysis,
             'success_rate': success_rate,
             'next_recommendation': self.get_recommended_problem(student_id, problem.category),
             'encouragement': self._generate_encouragement(success_rate, analysis['score'])
         }
     
-    def _run_tests(self, code: str, test_cases: List[Tuple]) -> List[Dict]:
+    def _run_tests(self, code: str, test_cases: List[Tuple]) -> Tuple[bytearray, List, Dict[int, str]]:
         """Simulate test execution (in practice, use secure code execution)"""
-        results = []
+        actuals = []  # Output of each test case, by position
+        errors = {}  # Position -> message, for test cases that failed to run
         
         for i, (inputs, expected) in enumerate(test_cases):
             try:
                 # Note: In production, use secure code execution environment
                 # This is a simplified simulation
-                result = {
-                    'test_case': i + 1,
-                    'inputs': inputs,
-                    'expected': expected,
-                    'passed': random.random() > 0.3,  # Simulated result
-                    'actual': expected if random.random() > 0.3 else "different_result"
-                }
+                actual = expected if random.random() > 0.3 else "different_result"  # Simulated result
             except Exception as e:
-                result = {
-                    'test_case': i + 1,
-                    'inputs': inputs,
-                    'expected': expected,
-                    'passed': False,
-                    'error': str(e)
-                }
-            results.append(result)
+                actual = None
+                errors[i] = str(e)
+            actuals.append(actual)
         
+        # Grade every test case in one pass
+        passed = self._score_tests(actuals, [expected for _, expected in test_cases])
+        for i in errors:
+            passed[i] = False
+        
+        return passed, actuals, errors
+    
+    @staticmethod
+    def _score_tests(actuals: List, expecteds: List) -> bytearray:
+        """Compare actual outputs against expected outputs, one flag per test case"""
+        return bytearray(actual == expected for actual, expected in zip(actuals, expecteds))
+    
+    @staticmethod
+    def _format_test_results(test_cases: List[Tuple], passed: bytearray, actuals: List,
+                             errors: Dict[int, str]) -> List[Dict]:
+        """Expand packed test outcomes into one result dict per test case"""
+        results = []
+        for i, (inputs, expected) in enumerate(test_cases):
+            result = {
+                'test_case': i + 1,
+                'inputs': inputs,
+                'expected': expected,
+                'passed': bool(passed[i])
+            }
+            if i in errors:
+                result['error'] = errors[i]
+            else:
+                result['actual'] = actuals[i]
+            results.append(result)
         return results
     
     def _generate_encouragement(self, success_rate: float, quality_score: float) -> str:
@@ -308,11 +439,20 @@ class AICodingTutor:
         session = {
             'student_id': student_id,
             'problem_id': problem_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp_ns': time.time_ns(),
             'success_rate': success_rate,
             'quality_score': quality_score
         }
         self.session_history.append(session)
+    
+    def export_session_history(self) -> str:
+        """Serialize the session log to JSON with ISO-8601 timestamps"""
+        exported = []
+        for session in self.session_history:
+            record = dict(session)
+            record['timestamp'] = _to_iso(record.pop('timestamp_ns'))
+            exported.append(record)
+        return json.dumps(exported)
 
 
 # Example usage and demonstration
@@ -360,7 +500,7 @@ def fibonacci(n):
     
     # Show student progress
     print(f"\n📈 Student Progress:")
-    print(f"Completed Problems: {len(student.completed_problems)}")
+    print(f"Completed Problems: {student.completed_count}")
     print(f"Current Streak: {student.current_streak} days")
     print(f"Skill Levels:")
     for category, level in student.skill_levels.items():
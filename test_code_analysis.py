@@ -0,0 +1,34 @@
+"""Checks for the whole-word naming and hardcoded-value rules in CodeAnalysis"""
+
+import importlib.util
+import os
+import unittest
+
+# The tutor lives in a file literally named ".py", which cannot be imported by name
+_spec = importlib.util.spec_from_file_location(
+    "tutor", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".py")
+)
+tutor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tutor)
+
+
+class WholeWordChecksTest(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = tutor.CodeAnalysis()
+        self.issues = self.analyzer.common_issues['python']
+
+    def suggestions(self, code: str) -> list:
+        analysis = {'suggestions': []}
+        self.analyzer._analyze_python_code(code, analysis)
+        return analysis['suggestions']
+
+    def test_names_and_numbers_inside_longer_words_do_not_trigger(self):
+        self.assertEqual(self.suggestions("database = x1005"), [])
+
+    def test_whole_word_names_and_numbers_trigger(self):
+        self.assertEqual(self.suggestions("data = 5"),
+                         [self.issues['poor_naming'], self.issues['hardcoded_values']])
+
+
+if __name__ == "__main__":
+    unittest.main()